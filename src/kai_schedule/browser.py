@@ -0,0 +1,352 @@
+"""Получение расписания через браузер (Selenium) — запасной вариант для getter."""
+
+import csv
+import functools
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException
+from webdriver_manager.chrome import ChromeDriverManager
+
+from kai_schedule.getter import SCHEDULE_PAGE_URL
+
+logger = logging.getLogger(__name__)
+
+PAGE_LOAD_TIMEOUT = 20
+SCRIPT_TIMEOUT = 10
+CHROMEDRIVER_PATH = Path(os.environ.get("CHROMEDRIVER_PATH", Path.home() / ".cache" / "kai_schedule" / "chromedriver"))
+
+
+def check_chrome_version():
+    """Проверяет версию установленного Chrome.
+
+    Возвращает:
+        str: Версия Chrome или None, если Chrome не установлен.
+    """
+    try:
+        result = subprocess.run(["google-chrome", "--version"], capture_output=True, text=True)
+        version = result.stdout.strip()
+        logger.info(f"Версия Chrome: {version}")
+        return version
+    except FileNotFoundError:
+        logger.error("Google Chrome не установлен. Установите его с помощью 'sudo apt-get install google-chrome-stable'.")
+        return None
+    except Exception as e:
+        logger.error(f"Ошибка при проверке версии Chrome: {e}")
+        return None
+
+
+def _major_version(version_output):
+    """
+    Извлекает мажорную версию из вывода вида "Google Chrome 139.0.7258.66".
+    """
+    match = re.search(r"(\d+)\.", version_output or "")
+    return match.group(1) if match else None
+
+
+def check_chromedriver_version(path):
+    """
+    Проверяет версию ChromeDriver по указанному пути.
+    Возвращает:
+        str: Версия ChromeDriver или None в случае ошибки.
+    """
+    try:
+        result = subprocess.run([str(path), "--version"], capture_output=True, text=True)
+        return result.stdout.strip()
+    except OSError as e:
+        logger.error(f"Ошибка при проверке версии ChromeDriver: {e}")
+        return None
+
+
+@functools.cache
+def get_chromedriver_path(chrome_version):
+    """
+    Возвращает путь к ChromeDriver, подходящему к установленному Chrome.
+    Используется локальный бинарник CHROMEDRIVER_PATH; ChromeDriverManager
+    вызывается только при его отсутствии или несовпадении мажорной версии.
+    Аргументы:
+        chrome_version (str): Вывод check_chrome_version().
+    """
+    chrome_major = _major_version(chrome_version)
+    if CHROMEDRIVER_PATH.exists() and chrome_major and _major_version(check_chromedriver_version(CHROMEDRIVER_PATH)) == chrome_major:
+        logger.info(f"Используется локальный ChromeDriver: {CHROMEDRIVER_PATH}")
+        return str(CHROMEDRIVER_PATH)
+
+    installed_path = ChromeDriverManager().install()
+    try:
+        CHROMEDRIVER_PATH.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(installed_path, CHROMEDRIVER_PATH)
+    except OSError as e:
+        logger.warning(f"Не удалось сохранить ChromeDriver в {CHROMEDRIVER_PATH}: {e}")
+        return installed_path
+    logger.info(f"ChromeDriver сохранен в {CHROMEDRIVER_PATH}")
+    return str(CHROMEDRIVER_PATH)
+
+
+def setup_driver(headless=True):
+    """
+    Настраивает веб-драйвер Chrome.
+    Аргументы:
+        headless (bool): Запускать ли в фоновом режиме.
+    Возвращает:
+        webdriver: Объект драйвера Chrome или None в случае ошибки.
+    """
+    try:
+        chrome_version = check_chrome_version()
+        if not chrome_version:
+            return None
+
+        chrome_options = Options()
+        # Картинки, стили и шрифты не нужны для работы с формой выбора группы
+        chrome_options.add_experimental_option(
+            "prefs",
+            {
+                "profile.managed_default_content_settings.images": 2,
+                "permissions.default.stylesheet": 2,
+                "profile.managed_default_content_settings.fonts": 2,
+            },
+        )
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--disable-sync")
+        chrome_options.add_argument("--metrics-recording-only")
+        # driver.get возвращается по DOMContentLoaded, не дожидаясь всех ресурсов
+        chrome_options.page_load_strategy = "eager"
+        if headless:
+            chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+
+        service = Service(get_chromedriver_path(chrome_version))
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(SCRIPT_TIMEOUT)
+        driver.set_window_size(1920, 1080)
+        logger.info("Веб-драйвер успешно настроен.")
+        return driver
+    except Exception as e:
+        logger.error(f"Ошибка при настройке веб-драйвера: {e}")
+        return None
+
+
+class KaiScheduleFetcher:
+    """
+    Получение расписания через браузер (Selenium) с переиспользованием одного Chrome.
+    Запасной вариант на случай изменения AJAX-эндпоинта.
+    Драйвер запускается один раз в __enter__ и закрывается в __exit__,
+    поэтому повторные вызовы fetch платят только за отправку формы.
+    Аргументы:
+        headless (bool): Запускать ли в фоновом режиме.
+        debug (bool): Сохранять ли HTML страницы в schedule.html.
+    """
+
+    def __init__(self, headless=True, debug=False):
+        self.headless = headless
+        self.debug = debug
+        self.driver = None
+
+    def __enter__(self):
+        self.driver = setup_driver(headless=self.headless)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+            logger.info("Веб-драйвер закрыт.")
+
+    def _open_page(self):
+        """
+        Открывает страницу расписания, если она ещё не открыта, и закрывает модальные окна.
+        """
+        url = SCHEDULE_PAGE_URL
+        if self.driver.current_url == url:
+            return
+
+        # Шаг 1: Открываем страницу
+        try:
+            self.driver.get(url)
+        except TimeoutException:
+            # К DOMContentLoaded форма уже в DOM, зависший сторонний ресурс не мешает
+            logger.warning(f"Превышено время загрузки страницы: {url}, продолжаем.")
+        logger.info(f"Открыта страница: {url}")
+
+        # Шаг 2: Закрываем возможные модальные окна (например, cookies)
+        try:
+            cookie_button = WebDriverWait(self.driver, 5).until(
+                EC.element_to_be_clickable(
+                    (
+                        By.CSS_SELECTOR,
+                        "button.accept-cookies, button[id*='cookie'], button[class*='cookie']",
+                    )
+                )
+            )
+            cookie_button.click()
+            logger.info("Модальное окно (cookies) закрыто.")
+        except:
+            logger.info("Модальное окно не найдено, продолжаем.")
+
+    def fetch(self, group_number):
+        """
+        Получает расписание для указанной группы.
+        Аргументы:
+            group_number (str): Номер группы, например, "4301".
+        Возвращает:
+            list: Список словарей с данными расписания или None в случае ошибки.
+        """
+        driver = self.driver
+        if not driver:
+            return None
+
+        try:
+            self._open_page()
+
+            # Шаг 3: Находим поле ввода
+            input_field = WebDriverWait(driver, 20).until(
+                EC.element_to_be_clickable((By.ID, "_pubStudentSchedule_WAR_publicStudentSchedule10_group"))
+            )
+            logger.info("Поле ввода найдено.")
+
+            # Шаг 4: Вводим номер группы одной командой
+            input_field.clear()
+            input_field.send_keys(group_number)
+            logger.info(f"Введен номер группы: {group_number}")
+
+            # Шаг 5: Ждем появления выпадающего списка
+            WebDriverWait(driver, 20).until(EC.visibility_of_element_located((By.CSS_SELECTOR, "ul.yui3-aclist-list")))
+            logger.info("Выпадающий список найден.")
+
+            # Шаг 6: Выбираем группу
+            dropdown_option = WebDriverWait(driver, 20).until(EC.element_to_be_clickable((By.XPATH, f"//li[@data-text='{group_number}']")))
+            dropdown_option.click()
+            logger.info(f"Выбрана группа: {group_number}")
+
+            # Таблица предыдущей группы, если страница переиспользуется
+            previous_tables = driver.find_elements(By.CSS_SELECTOR, "table, div.table-responsive")
+
+            # Шаг 7: Нажимаем кнопку для загрузки расписания
+            driver.find_element(By.ID, "_pubStudentSchedule_WAR_publicStudentSchedule10_schedule").click()
+            logger.info("Нажата кнопка для загрузки расписания.")
+
+            # Шаг 8: Ждем загрузки таблицы расписания
+            if previous_tables:
+                try:
+                    WebDriverWait(driver, 20).until(EC.staleness_of(previous_tables[0]))
+                except TimeoutException:
+                    logger.warning("Таблица расписания не обновилась, используется текущая.")
+            WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CSS_SELECTOR, "table, div.table-responsive")))
+            logger.info("Таблица расписания найдена.")
+
+            html_content = driver.page_source
+            if self.debug:
+                with open("schedule.html", "w", encoding="utf-8") as f:
+                    f.write(html_content)
+                logger.info("HTML страницы сохранен как schedule.html")
+
+            # Шаг 9: Парсим HTML страницы
+            from selectolax.lexbor import LexborHTMLParser
+
+            tree = LexborHTMLParser(html_content)
+            schedule_table = tree.css_first("table") or tree.css_first("div.table-responsive")
+            if not schedule_table:
+                logger.warning("Таблица расписания не найдена в HTML.")
+                driver.save_screenshot("error_screenshot.png")
+                logger.info("Скриншот страницы сохранен как error_screenshot.png")
+                return None
+
+            # Извлекаем данные из таблицы
+            schedule_data = []
+            rows = schedule_table.css("tr")[1:]  # Пропускаем заголовок
+            for row in rows:
+                cols = [col.text().strip() for col in row.css("td")]
+                if len(cols) >= 8:
+                    schedule_data.append(
+                        {
+                            "day": cols[0],
+                            "time": cols[1],
+                            "date": cols[2],
+                            "discipline": cols[3],
+                            "type": cols[4],
+                            "room": cols[5],
+                            "building": cols[6],
+                            "teacher": cols[7],
+                            "department": cols[8] if len(cols) > 8 else "",
+                        }
+                    )
+
+            logger.info(f"Расписание для группы {group_number} успешно получено. Найдено {len(schedule_data)} записей.")
+            return schedule_data
+
+        except Exception as e:
+            logger.error(f"Ошибка при получении расписания: {e}")
+            driver.save_screenshot("error_screenshot.png")
+            logger.info("Скриншот страницы сохранен как error_screenshot.png")
+            return None
+
+
+def get_schedule_browser(group_number, debug=False):
+    """
+    Получает расписание для одной группы через браузер.
+    Для нескольких групп используйте KaiScheduleFetcher напрямую, чтобы не запускать Chrome заново.
+    Аргументы:
+        group_number (str): Номер группы, например, "4301".
+        debug (bool): Сохранять ли HTML страницы в schedule.html.
+    Возвращает:
+        list: Список словарей с данными расписания или None в случае ошибки.
+    """
+    with KaiScheduleFetcher(headless=True, debug=debug) as fetcher:
+        return fetcher.fetch(group_number)
+
+
+def save_to_csv(schedule, filename="schedule.csv"):
+    """
+    Сохраняет расписание в CSV-файл.
+    """
+    if not schedule:
+        logger.warning("Нет данных для сохранения в CSV.")
+        return
+
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=schedule[0].keys())
+        writer.writeheader()
+        writer.writerows(schedule)
+    logger.info(f"Расписание сохранено в файл: {filename}")
+
+
+def main():
+    """
+    Парсинг расписания через браузер.
+    """
+    group_number = "4301"
+
+    schedule = get_schedule_browser(group_number)
+    if not schedule:
+        logger.error("Не удалось получить расписание.")
+        sys.exit(1)
+
+    for entry in schedule:
+        print(
+            f"День: {entry['day']}, Время: {entry['time']}, Дата: {entry['date']}, "
+            f"Дисциплина: {entry['discipline']}, Вид: {entry['type']}, "
+            f"Аудитория: {entry['room']}, Здание: {entry['building']}, "
+            f"Преподаватель: {entry['teacher']}, Кафедра: {entry['department']}"
+        )
+
+    save_to_csv(schedule)
+
+
+if __name__ == "__main__":
+    main()
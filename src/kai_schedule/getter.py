@@ -1,216 +1,179 @@
-import time
+"""Получение JSON расписания КАИ через AJAX-эндпоинт портлета с файловым кэшем."""
+
+import functools
+import json
 import logging
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.keys import Keys
-from bs4 import BeautifulSoup
-from webdriver_manager.chrome import ChromeDriverManager
-import subprocess
+import os
 import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import requests
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
 # Настройка логирования
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+SCHEDULE_PAGE_URL = "https://kai.ru/web/studentu/raspisanie1"
+SCHEDULE_RESOURCE_URL = "https://kai.ru/raspisanie"
+PORTLET_ID = "pubStudentSchedule_WAR_publicStudentSchedule10"
+REQUEST_TIMEOUT = 10
+CACHE_TTL = timedelta(hours=6)
 
-def check_chrome_version():
-    """Проверяет версию установленного Chrome.
-
-    Возвращает:
-        str: Версия Chrome или None, если Chrome не установлен.
-    """
-    try:
-        result = subprocess.run(["google-chrome", "--version"], capture_output=True, text=True)
-        version = result.stdout.strip()
-        logger.info(f"Версия Chrome: {version}")
-        return version
-    except FileNotFoundError:
-        logger.error("Google Chrome не установлен. Установите его с помощью 'sudo apt-get install google-chrome-stable'.")
-        return None
-    except Exception as e:
-        logger.error(f"Ошибка при проверке версии Chrome: {e}")
-        return None
 
+@functools.cache
+def get_session() -> "requests.Session":
+    """Возвращает одну сессию на процесс: keep-alive и переиспользование TCP/TLS-соединений.
 
-def setup_driver(headless=True):
+    requests импортируется здесь, чтобы попадание в кэш не платило за его импорт.
     """
-    Настраивает веб-драйвер Chrome.
-    Аргументы:
-        headless (bool): Запускать ли в фоновом режиме.
-    Возвращает:
-        webdriver: Объект драйвера Chrome или None в случае ошибки.
+    import requests  # noqa: PLC0415
+    from requests.adapters import HTTPAdapter  # noqa: PLC0415
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    session.headers.update(
+        {
+            "Connection": "keep-alive",
+            "Referer": SCHEDULE_PAGE_URL,
+            "X-Requested-With": "XMLHttpRequest",
+        }
+    )
+    return session
+
+
+def _portlet_request(resource_id: str, data: dict[str, str | int]) -> Any:  # noqa: ANN401
+    """Выполняет AJAX-запрос к портлету расписания КАИ.
+
+    Args:
+        resource_id (str): Значение p_p_resource_id, например, "schedule".
+        data (dict[str, str | int]): Тело POST-запроса.
+
+    Returns:
+        Any: Разобранный JSON-ответ.
     """
-    try:
-        chrome_version = check_chrome_version()
-        if not chrome_version:
-            return None
+    params = {
+        "p_p_id": PORTLET_ID,
+        "p_p_lifecycle": "2",
+        "p_p_resource_id": resource_id,
+    }
+    response = get_session().post(SCHEDULE_RESOURCE_URL, params=params, data=data, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
 
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        driver.set_window_size(1920, 1080)
-        logger.info("Веб-драйвер успешно настроен.")
-        return driver
-    except Exception as e:
-        logger.error(f"Ошибка при настройке веб-драйвера: {e}")
-        return None
 
+def get_group_id(group_number: str) -> int | None:
+    """Получает внутренний идентификатор группы по её номеру.
 
-def get_schedule(group_number):
-    """
-    Получает расписание для указанной группы.
-    Аргументы:
+    Args:
         group_number (str): Номер группы, например, "4301".
-    Возвращает:
-        list: Список словарей с данными расписания или None в случае ошибки.
+
+    Returns:
+        int | None: Идентификатор группы или None, если группа не найдена.
     """
-    driver = setup_driver(headless=True)  # Для отладки
-    if not driver:
+    groups = _portlet_request("getGroupsURL", {"query": group_number})
+    if not isinstance(groups, list):
+        logger.error(f"Неожиданный ответ при поиске группы: {groups}")
         return None
+    for group in groups:
+        if isinstance(group, dict) and group.get("group") == group_number:
+            return group.get("id")
+    return None
 
-    try:
-        # Шаг 1: Открываем страницу
-        url = "https://kai.ru/web/studentu/raspisanie1"
-        driver.get(url)
-        logger.info(f"Открыта страница: {url}")
 
-        # Шаг 2: Закрываем возможные модальные окна (например, cookies)
-        try:
-            cookie_button = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable(
-                    (
-                        By.CSS_SELECTOR,
-                        "button.accept-cookies, button[id*='cookie'], button[class*='cookie']",
-                    )
-                )
-            )
-            cookie_button.click()
-            logger.info("Модальное окно (cookies) закрыто.")
-        except:
-            logger.info("Модальное окно не найдено, продолжаем.")
-
-        # Шаг 3: Находим поле ввода
-        input_field = WebDriverWait(driver, 20).until(EC.element_to_be_clickable((By.ID, "_pubStudentSchedule_WAR_publicStudentSchedule10_group")))
-        logger.info("Поле ввода найдено.")
-
-        # Шаг 4: Вводим номер группы посимвольно
-        input_field.clear()
-        for char in group_number:
-            input_field.send_keys(char)
-            # time.sleep(0.5)  # Задержка для активации автодополнения
-        logger.info(f"Введен номер группы: {group_number}")
-
-        # Шаг 5: Ждем появления выпадающего списка
-        dropdown_list = WebDriverWait(driver, 20).until(EC.visibility_of_element_located((By.CSS_SELECTOR, "ul.yui3-aclist-list")))
-        logger.info("Выпадающий список найден.")
-
-        # Шаг 6: Выбираем группу
-        dropdown_option = WebDriverWait(driver, 20).until(EC.element_to_be_clickable((By.XPATH, f"//li[@data-text='{group_number}']")))
-        dropdown_option.click()
-        logger.info(f"Выбрана группа: {group_number}")
-
-        # # Шаг 7: Нажимаем кнопку для загрузки расписания
-        # submit_button = WebDriverWait(driver, 20).until(
-        #     EC.element_to_be_clickable(
-        #         (
-        #             By.CSS_SELECTOR,
-        #             "button.btn, button[type='submit'], input[type='submit']",
-        #         )
-        #     )
-        # )
-        driver.find_element(By.ID, "_pubStudentSchedule_WAR_publicStudentSchedule10_schedule").click()
-        html_content = driver.page_source
-        print(html_content)
-        with open("schedule.html", "w", encoding="utf-8") as f:
-            f.write(html_content)
-
-        input()
-        logger.info("Нажата кнопка для загрузки расписания.")
-
-        # # Шаг 8: Ждем загрузки таблицы расписания
-        # WebDriverWait(driver, 20).until(
-        #     EC.presence_of_element_located(
-        #         (By.CSS_SELECTOR, "table, div.table-responsive")
-        #     )
-        # )
-        # logger.info("Таблица расписания найдена.")
-
-        # # Шаг 9: Парсим HTML страницы
-        # soup = BeautifulSoup(driver.page_source, "html.parser")
-        # schedule_table = soup.find("table") or soup.find(
-        #     "div", class_="table-responsive"
-        # )
-        # if not schedule_table:
-        #     logger.warning("Таблица расписания не найдена в HTML.")
-        #     driver.save_screenshot("error_screenshot.png")
-        #     logger.info("Скриншот страницы сохранен как error_screenshot.png")
-        #     return None
-
-        # # Извлекаем данные из таблицы
-        # schedule_data = []
-        # rows = schedule_table.find_all("tr")[1:]  # Пропускаем заголовок
-        # for row in rows:
-        #     cols = row.find_all("td")
-        #     if len(cols) >= 7:
-        #         schedule_data.append(
-        #             {
-        #                 "day": cols[0].text.strip(),
-        #                 "time": cols[1].text.strip(),
-        #                 "date": cols[2].text.strip(),
-        #                 "discipline": cols[3].text.strip(),
-        #                 "type": cols[4].text.strip(),
-        #                 "room": cols[5].text.strip(),
-        #                 "building": cols[6].text.strip(),
-        #                 "teacher": cols[7].text.strip(),
-        #                 "department": cols[8].text.strip() if len(cols) > 8 else "",
-        #             }
-        #         )
-
-        # logger.info(
-        #     f"Расписание для группы {group_number} успешно получено. Найдено {len(schedule_data)} записей."
-        # )
-        # return schedule_data
-
-    except Exception as e:
-        logger.error(f"Ошибка при получении расписания: {e}")
-        driver.save_screenshot("error_screenshot.png")
-        logger.info("Скриншот страницы сохранен как error_screenshot.png")
-        return None
-    finally:
-        driver.quit()
-        logger.info("Веб-драйвер закрыт.")
+def get_schedule(group_number: str) -> dict[str, list[dict[str, str]]] | None:
+    """Получает расписание для указанной группы напрямую через AJAX-эндпоинт портлета.
 
+    Args:
+        group_number (str): Номер группы, например, "4301".
 
-def save_to_csv(schedule, filename="schedule.csv"):
-    """
-    Сохраняет расписание в CSV-файл.
+    Returns:
+        dict[str, list[dict[str, str]]] | None: JSON расписания по дням недели
+            (формат, который читает JSONScheduleParser) или None в случае ошибки.
     """
-    if not schedule:
-        logger.warning("Нет данных для сохранения в CSV.")
-        return
+    import requests  # noqa: PLC0415
+
+    try:
+        group_id = get_group_id(group_number)
+        if group_id is None:
+            logger.error(f"Группа {group_number} не найдена.")
+            return None
+        schedule = _portlet_request("schedule", {"groupId": group_id})
+        if not isinstance(schedule, dict):
+            logger.error(f"Неожиданный ответ при получении расписания: {schedule}")
+            return None
+        logger.info(f"Расписание для группы {group_number} успешно получено.")
+        return schedule
+    except (requests.RequestException, ValueError) as e:
+        logger.exception(f"Ошибка при получении расписания: {e}")
+        return None
 
-    import csv
 
-    with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=schedule[0].keys())
-        writer.writeheader()
-        writer.writerows(schedule)
-    logger.info(f"Расписание сохранено в файл: {filename}")
+def fetch_schedule_cached(group_number: str, ttl: timedelta = CACHE_TTL) -> dict[str, list[dict[str, str]]] | None:
+    """Получает расписание группы с файловым кэшем во временной директории.
 
+    Args:
+        group_number (str): Номер группы, например, "4301".
+        ttl (timedelta): Время жизни кэша.
 
-def main():
+    Returns:
+        dict[str, list[dict[str, str]]] | None: JSON расписания или None в случае ошибки.
     """
-    Основная функция для выполнения парсинга.
+    cache_path = Path(tempfile.gettempdir()) / f"kai_{group_number}.json"
+    if cache_path.exists() and time.time() - cache_path.stat().st_mtime < ttl.total_seconds():
+        try:
+            schedule = _json.loads(cache_path.read_bytes())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Не удалось прочитать кэш расписания, загружаем заново: {cache_path}: {e}")
+        else:
+            if isinstance(schedule, dict):
+                logger.info(f"Расписание для группы {group_number} взято из кэша: {cache_path}")
+                return schedule
+            logger.warning(f"Неожиданное содержимое кэша расписания, загружаем заново: {cache_path}")
+
+    schedule = get_schedule(group_number)
+    if schedule:
+        _write_cache(cache_path, schedule)
+    return schedule
+
+
+def _write_cache(cache_path: Path, schedule: dict[str, list[dict[str, str]]]) -> None:
+    """Атомарно записывает кэш: во временный файл рядом, затем Path.replace.
+
+    Прерванная запись не оставляет обрезанный файл кэша.
     """
+    tmp_name = None
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, prefix=f"{cache_path.name}.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(schedule, f, ensure_ascii=False)
+        Path(tmp_name).replace(cache_path)
+    except OSError as e:
+        logger.warning(f"Не удалось сохранить кэш расписания {cache_path}: {e}")
+        if tmp_name is not None:
+            Path(tmp_name).unlink(missing_ok=True)
+
+
+def save_to_json(schedule: dict[str, list[dict[str, str]]], filename: str = "local_files/r.json") -> None:
+    """Сохраняет JSON расписания в файл."""
+    path = Path(filename)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(schedule, f, ensure_ascii=False)
+    logger.info(f"Расписание сохранено в файл: {filename}")
+
+
+def main() -> None:
+    """Основная функция для выполнения парсинга."""
     group_number = "4301"
 
     schedule = get_schedule(group_number)
@@ -218,15 +181,7 @@ def main():
         logger.error("Не удалось получить расписание.")
         sys.exit(1)
 
-    for entry in schedule:
-        print(
-            f"День: {entry['day']}, Время: {entry['time']}, Дата: {entry['date']}, "
-            f"Дисциплина: {entry['discipline']}, Вид: {entry['type']}, "
-            f"Аудитория: {entry['room']}, Здание: {entry['building']}, "
-            f"Преподаватель: {entry['teacher']}, Кафедра: {entry['department']}"
-        )
-
-    save_to_csv(schedule)
+    save_to_json(schedule)
 
 
 if __name__ == "__main__":
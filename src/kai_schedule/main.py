@@ -3,35 +3,34 @@
 from pathlib import Path
 
 from datetime import datetime
-from zoneinfo import ZoneInfo
-from kai_schedule.parser import ICSScheduleItem, JSONScheduleParser, create_ics_calendar
+from kai_schedule.getter import fetch_schedule_cached
+from kai_schedule.parser import MSK, JSONScheduleParser, write_ics_calendar
 def main()->None:
 
-    path = Path("./local_files/r.json")
-    with path.open(encoding="utf-8") as f:
-        json_content = f.read()
+    group_number = input("Номер группы (Enter=4301): ").strip() or "4301"
+    json_content = fetch_schedule_cached(group_number)
+    if json_content is None:
+        path = Path("./local_files/r.json")
+        print(f"Не удалось получить расписание, используется локальный файл: {path}")
+        json_content = path.read_bytes()
 
     # Ввод начальной и конечной даты семестра
     start_date_str = input("Начало семестра (ДД.ММ.ГГГГ, Enter=02.02.2026): ") or "02.02.2026"
     end_date_str = input("Конец семестра (ДД.ММ.ГГГГ, Enter=31.05.2026): ") or "31.05.2026"
     
-    start_date = datetime.strptime(start_date_str, "%d.%m.%Y").replace(tzinfo=ZoneInfo("Europe/Moscow"))
-    end_date = datetime.strptime(end_date_str, "%d.%m.%Y").replace(tzinfo=ZoneInfo("Europe/Moscow"))
+    start_date = datetime.strptime(start_date_str, "%d.%m.%Y").replace(tzinfo=MSK)
+    end_date = datetime.strptime(end_date_str, "%d.%m.%Y").replace(tzinfo=MSK)
     
     print(f"Генерация с {start_date.strftime('%d.%m.%Y')} по {end_date.strftime('%d.%m.%Y')}")
     
     parser = JSONScheduleParser(json_content, start_date=start_date, end_date=end_date)
     items = parser.parse()
 
-    # Преобразуем каждый элемент в VEVENT
-    events = [str(ICSScheduleItem(schedule_item=item).to_ics()) for item in items]
-
-    # Собираем календарь через функцию
-    ics_content = create_ics_calendar(events)
-
+    # Записываем события в календарь по одному, без сборки всего ICS в памяти
     ics_path = Path("./local_files/schedule.ics")
-    with ics_path.open("w", encoding="utf-8") as ics_file:
-        ics_file.write(ics_content)
+    ics_path.parent.mkdir(parents=True, exist_ok=True)
+    with ics_path.open("w", encoding="utf-8", newline="") as ics_file:
+        write_ics_calendar(items, ics_file)
 
     print(f"Файл ICS успешно сохранён: {ics_path}")
     print(f"События сгенерированы с {start_date.strftime('%d.%m.%Y')} по {end_date.strftime('%d.%m.%Y')}!")
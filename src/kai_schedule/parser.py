@@ -1,13 +1,16 @@
 """Парсер JSON расписания для создания ICS-файла."""
 
-import json
 import logging
-from collections.abc import Sequence
+from collections.abc import Iterable
 from datetime import datetime, time, timedelta
 from pathlib import Path
+from typing import ClassVar, TextIO
 from zoneinfo import ZoneInfo
 
-import icalendar
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
 from kai_schedule.schedule_item import (
     DefaultScheduleItemFormatter,
@@ -20,26 +23,55 @@ from kai_schedule.schedule_item import (
 
 logger = logging.getLogger(__name__)
 
+MSK = ZoneInfo("Europe/Moscow")
+
+ICS_DATETIME_FORMAT = "%Y%m%dT%H%M%S"
+ICS_LINE_LIMIT = 75  # октетов, RFC 5545 3.1
+ICS_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n", "\r": ""})
+VEVENT_TMPL = (
+    "BEGIN:VEVENT\r\n"
+    "SUMMARY:{summary}\r\n"
+    "DTSTART;TZID=Europe/Moscow:{dtstart}\r\n"
+    "DTEND;TZID=Europe/Moscow:{dtend}\r\n"
+    "LOCATION:{location}\r\n"
+    "DESCRIPTION:{description}\r\n"
+    "{rrule}"
+    "END:VEVENT"
+)
+
 
 class JSONScheduleParser:
     """Парсер JSON-данных расписания для создания массива ScheduleItem."""
 
-    def __init__(self, json_content: str, start_date: datetime | None = None, end_date: datetime | None = None, start_year: int = 2025):
-        self.data = json.loads(json_content)
+    weekday_map: ClassVar[dict[str, Weekday]] = {
+        "1": Weekday.MONDAY,
+        "2": Weekday.TUESDAY,
+        "3": Weekday.WEDNESDAY,
+        "4": Weekday.THURSDAY,
+        "5": Weekday.FRIDAY,
+        "6": Weekday.SATURDAY,
+        "7": Weekday.SUNDAY,
+    }
+
+    def __init__(
+        self,
+        json_content: str | bytes | dict[str, list[dict[str, str]]],
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        start_year: int = 2025,
+    ):
+        self.data = _json.loads(json_content) if isinstance(json_content, str | bytes) else json_content
         self.start_date = start_date
         self.end_date = end_date
         self.start_year = start_year
-        self.semester_start = start_date or datetime(start_year, 9, 1, tzinfo=ZoneInfo("Europe/Moscow"))
-        self.semester_end = end_date or datetime(self.start_year, 12, 31, tzinfo=ZoneInfo("Europe/Moscow"))
-        self.weekday_map = {
-            "1": Weekday.MONDAY,
-            "2": Weekday.TUESDAY,
-            "3": Weekday.WEDNESDAY,
-            "4": Weekday.THURSDAY,
-            "5": Weekday.FRIDAY,
-            "6": Weekday.SATURDAY,
-            "7": Weekday.SUNDAY,
-        }
+        self.semester_start = start_date or datetime(start_year, 9, 1, tzinfo=MSK)
+        self.semester_end = end_date or datetime(self.start_year, 12, 31, tzinfo=MSK)
+        self._semester_start_is_even = self._is_even_week(self.semester_start)
+        # Первые даты для всех сочетаний (день недели, четность) — не более 14 вариантов
+        self._first_occurrences: dict[tuple[Weekday, bool], datetime] = {}
+        for weekday in Weekday:
+            for is_even in (False, True):
+                self._first_occurrences[(weekday, is_even)] = self._get_first_occurrence(weekday, self.semester_start, is_even)
 
     def _is_even_week(self, date: datetime) -> bool:
         """Проверяет, является ли неделя для данной даты четной."""
@@ -49,8 +81,8 @@ class JSONScheduleParser:
     def _parse_time(self, time_str: str) -> time:
         """Парсит время из строки формата 'ЧЧ:ММ'."""
         try:
-            dt = datetime.strptime(time_str.strip(), "%H:%M")
-            return dt.time()
+            hours, minutes = time_str.strip().split(":", 1)
+            return time(int(hours), int(minutes))
         except ValueError as e:
             logger.critical(f"Ошибка в парсинге времени: {time_str}")
             raise e
@@ -62,14 +94,15 @@ class JSONScheduleParser:
             return []
 
         parsed_dates: list[datetime] = []
+        year = self.semester_start.year
         dates = date_str.split()
         for d in dates:
             d = d.strip()
             if not d:
                 continue
             try:
-                year = self.semester_start.year
-                parsed_date = datetime.strptime(f"{d}.{year}", "%d.%m.%Y").replace(tzinfo=ZoneInfo("Europe/Moscow"))
+                day, month = d.split(".")
+                parsed_date = datetime(year, int(month), int(day), tzinfo=MSK)
                 parsed_dates.append(parsed_date)
             except ValueError as e:
                 logger.critical(f"Ошибка в парсинге даты: {d}")
@@ -92,75 +125,60 @@ class JSONScheduleParser:
             if day_num not in self.weekday_map:
                 logger.warning(f"Неизвестный день недели: {day_num}")
                 continue
-            target_weekday = self.weekday_map[day_num]
-            logger.info(f"Парсинг дня недели: {day_num} ({target_weekday})")
-
-            for event in events:
-                subject = event.get("disciplName", "").strip()
-                lesson_type = event.get("disciplType", "").strip()
-                audience = event.get("audNum", "").strip()
-                building = event.get("buildNum", "").strip()
-                teacher = event.get("prepodName", "").strip()
-                department = event.get("orgUnitName", "").strip()
-                time_str = event.get("dayTime", "").strip()
-                date_str = event.get("dayDate", "").strip()
-
-                if not all([subject, lesson_type, audience, building, teacher, department, time_str]):
-                    logger.warning(f"Пропущено событие из-за отсутствия данных: {event}")
-                    continue
-
-                start_time = self._parse_time(time_str)
-                duration = timedelta(minutes=90)  # Предполагаемая длительность занятия 1.5 часа
-
-                # Обработка дат и повторений
-                if date_str in ["чет", "неч"]:
-                    is_even = date_str == "чет"
-                    start_date = self._get_first_occurrence(target_weekday, self.semester_start, is_even)
-                    start_datetime = datetime.combine(start_date, start_time).replace(tzinfo=ZoneInfo("Europe/Moscow"))
-                    end_datetime = start_datetime + duration
-                    repeat_rule = WeeklyRepeatRule(
-                        weekdays=[target_weekday],
-                        interval=2,
-                        end=EndByDate(self.semester_end),
-                    )
-                    item = ScheduleItem(
-                        start_datetime=start_datetime,
-                        end_datetime=end_datetime,
-                        subject=subject,
-                        lesson_type=lesson_type,
-                        audience=audience,
-                        building=building,
-                        teacher=teacher,
-                        department=department,
-                        repeat_rule=repeat_rule,
-                    )
-                    schedule_items.append(item)
-                elif date_str:
-                    dates = self._parse_dates(date_str)
-                    for d in dates:
-                        start_datetime = datetime.combine(d, start_time).replace(tzinfo=ZoneInfo("Europe/Moscow"))
-                        end_datetime = start_datetime + duration
-                        item = ScheduleItem(
-                            start_datetime=start_datetime,
-                            end_datetime=end_datetime,
-                            subject=subject,
-                            lesson_type=lesson_type,
-                            audience=audience,
-                            building=building,
-                            teacher=teacher,
-                            department=department,
-                            repeat_rule=None,
-                        )
-                        schedule_items.append(item)
-                else:
-                    start_date = self._get_first_occurrence(target_weekday, self.semester_start, self._is_even_week(self.semester_start))
-                    start_datetime = datetime.combine(start_date, start_time).replace(tzinfo=ZoneInfo("Europe/Moscow"))
+            schedule_items.extend(self._parse_day(day_num, events))
+        return schedule_items
+
+    def _parse_day(self, day_num: str, events: list[dict[str, str]]) -> list[ScheduleItem]:
+        """Парсит события одного дня недели."""
+        target_weekday = self.weekday_map[day_num]
+        logger.info(f"Парсинг дня недели: {day_num} ({target_weekday})")
+
+        schedule_items = []
+        for event in events:
+            subject = event.get("disciplName", "").strip()
+            lesson_type = event.get("disciplType", "").strip()
+            audience = event.get("audNum", "").strip()
+            building = event.get("buildNum", "").strip()
+            teacher = event.get("prepodName", "").strip()
+            department = event.get("orgUnitName", "").strip()
+            time_str = event.get("dayTime", "").strip()
+            date_str = event.get("dayDate", "").strip()
+
+            if not (subject and lesson_type and audience and building and teacher and department and time_str):
+                logger.warning(f"Пропущено событие из-за отсутствия данных: {event}")
+                continue
+
+            start_time = self._parse_time(time_str)
+            duration = timedelta(minutes=90)  # Предполагаемая длительность занятия 1.5 часа
+
+            # Обработка дат и повторений
+            if date_str in ["чет", "неч"]:
+                is_even = date_str == "чет"
+                start_date = self._first_occurrences[(target_weekday, is_even)]
+                start_datetime = datetime.combine(start_date, start_time).replace(tzinfo=MSK)
+                end_datetime = start_datetime + duration
+                repeat_rule = WeeklyRepeatRule(
+                    weekdays=[target_weekday],
+                    interval=2,
+                    end=EndByDate(self.semester_end),
+                )
+                item = ScheduleItem(
+                    start_datetime=start_datetime,
+                    end_datetime=end_datetime,
+                    subject=subject,
+                    lesson_type=lesson_type,
+                    audience=audience,
+                    building=building,
+                    teacher=teacher,
+                    department=department,
+                    repeat_rule=repeat_rule,
+                )
+                schedule_items.append(item)
+            elif date_str:
+                dates = self._parse_dates(date_str)
+                for d in dates:
+                    start_datetime = datetime.combine(d, start_time).replace(tzinfo=MSK)
                     end_datetime = start_datetime + duration
-                    repeat_rule = WeeklyRepeatRule(
-                        weekdays=[target_weekday],
-                        interval=1,
-                        end=EndByDate(self.semester_end),
-                    )
                     item = ScheduleItem(
                         start_datetime=start_datetime,
                         end_datetime=end_datetime,
@@ -170,19 +188,42 @@ class JSONScheduleParser:
                         building=building,
                         teacher=teacher,
                         department=department,
-                        repeat_rule=repeat_rule,
+                        repeat_rule=None,
                     )
                     schedule_items.append(item)
+            else:
+                start_date = self._first_occurrences[(target_weekday, self._semester_start_is_even)]
+                start_datetime = datetime.combine(start_date, start_time).replace(tzinfo=MSK)
+                end_datetime = start_datetime + duration
+                repeat_rule = WeeklyRepeatRule(
+                    weekdays=[target_weekday],
+                    interval=1,
+                    end=EndByDate(self.semester_end),
+                )
+                item = ScheduleItem(
+                    start_datetime=start_datetime,
+                    end_datetime=end_datetime,
+                    subject=subject,
+                    lesson_type=lesson_type,
+                    audience=audience,
+                    building=building,
+                    teacher=teacher,
+                    department=department,
+                    repeat_rule=repeat_rule,
+                )
+                schedule_items.append(item)
 
         return schedule_items
 
 
-def create_ics_calendar(events: Sequence[str]) -> str:
-    """Принимает массив строк-мероприятий VEVENT и возвращает готовый ICS-календарь."""
-    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//KAI Schedule Parser//EN"]
-    lines.extend(events)
-    lines.append("END:VCALENDAR")
-    return "\n".join(lines)
+def write_ics_calendar(items: Iterable[ScheduleItem], f: TextIO, formatter: ScheduleItemFormatter | None = None) -> None:
+    """Записывает ICS-календарь в файл, сериализуя события по одному."""
+    formatter = formatter or DefaultScheduleItemFormatter()
+    f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//KAI Schedule Parser//EN\r\n")
+    for item in items:
+        f.write(ICSScheduleItem(schedule_item=item, formatter=formatter).to_ics())
+        f.write("\r\n")
+    f.write("END:VCALENDAR\r\n")
 
 
 class ICSScheduleItem:
@@ -194,12 +235,46 @@ class ICSScheduleItem:
 
     def to_ics(self) -> str:
         """Возвращает только VEVENT, без VCALENDAR."""
-        event = icalendar.Event()
-        event.add("summary", self.formatter.format_header(self.schedule_item))
-        event.add("dtstart", self.schedule_item.start_datetime)
-        event.add("dtend", self.schedule_item.end_datetime)
-        event.add("location", f"{self.schedule_item.building}, {self.schedule_item.audience}")
-        event.add("description", self.formatter.format_description(self.schedule_item))
-        if self.schedule_item.repeat_rule:
-            event.add("rrule", self.schedule_item.repeat_rule.to_rrule_str())
-        return event.to_ical().decode("utf-8")  # только VEVENT
+        item = self.schedule_item
+        rrule = f"RRULE:{item.repeat_rule.to_rrule_str()}\r\n" if item.repeat_rule else ""
+        vevent = VEVENT_TMPL.format(
+            summary=_escape_text(self.formatter.format_header(item)),
+            dtstart=_format_datetime(item.start_datetime),
+            dtend=_format_datetime(item.end_datetime),
+            location=_escape_text(f"{item.building}, {item.audience}"),
+            description=_escape_text(self.formatter.format_description(item)),
+            rrule=rrule,
+        )
+        return "\r\n".join(map(_fold_line, vevent.split("\r\n")))
+
+
+def _escape_text(value: str) -> str:
+    """Экранирует значение типа TEXT по RFC 5545 3.3.11."""
+    return value.translate(ICS_ESCAPE_TABLE)
+
+
+def _format_datetime(value: datetime) -> str:
+    """Форматирует дату для DTSTART/DTEND с TZID=Europe/Moscow."""
+    if value.tzinfo is not None:
+        value = value.astimezone(MSK)
+    return value.strftime(ICS_DATETIME_FORMAT)
+
+
+def _fold_line(line: str) -> str:
+    """Переносит строку длиннее 75 октетов, не разрывая символы UTF-8 (RFC 5545 3.1)."""
+    if len(line.encode("utf-8")) <= ICS_LINE_LIMIT:
+        return line
+    chunks: list[str] = []
+    chunk: list[str] = []
+    size = 0
+    limit = ICS_LINE_LIMIT
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        if size + char_size > limit:
+            chunks.append("".join(chunk))
+            chunk, size = [], 0
+            limit = ICS_LINE_LIMIT - 1  # строки продолжения начинаются с пробела
+        chunk.append(char)
+        size += char_size
+    chunks.append("".join(chunk))
+    return "\r\n ".join(chunks)
@@ -5,6 +5,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import IntEnum
 
+_ICAL_DAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
 
 class RepeatEnd(ABC):
     """Базовый класс для окончания повторения."""
@@ -66,16 +68,7 @@ class Weekday(IntEnum):
 
     @property
     def ical(self) -> str:
-        mapping = {
-            Weekday.MONDAY: "MO",
-            Weekday.TUESDAY: "TU",
-            Weekday.WEDNESDAY: "WE",
-            Weekday.THURSDAY: "TH",
-            Weekday.FRIDAY: "FR",
-            Weekday.SATURDAY: "SA",
-            Weekday.SUNDAY: "SU",
-        }
-        return mapping[self]
+        return _ICAL_DAYS[self.value]
 
 
 class BaseRepeatRule(ABC):
@@ -104,7 +97,7 @@ class BaseRepeatRule(ABC):
         parts.append(f"INTERVAL={self.interval}")
         if self.end:
             parts.append(self.end.to_rrule_arg_str())
-        return f"FREQ=WEEKLY;{';'.join(parts)}"
+        return ";".join(parts)
 
 
 class DailyRepeatRule(BaseRepeatRule):
@@ -127,10 +120,14 @@ class WeeklyRepeatRule(BaseRepeatRule):
         self.weekdays = weekdays or []
 
     def _to_rrule_str_args(self) -> list[str]:
-        args = ["FREQ=WEEKLY"]
-        if self.weekdays:
-            args.append("BYDAY=" + ",".join(d.ical for d in self.weekdays))
-        return args
+        return ["FREQ=WEEKLY"]
+
+    def to_rrule_str(self) -> str:
+        if not self.weekdays:
+            return super().to_rrule_str()
+        byday = ",".join(_ICAL_DAYS[d.value] for d in self.weekdays)
+        end = f";{self.end.to_rrule_arg_str()}" if self.end else ""
+        return f"FREQ=WEEKLY;BYDAY={byday};INTERVAL={self.interval}{end}"
 
 
 class MonthlyRepeatRule(BaseRepeatRule):
@@ -159,6 +156,7 @@ class YearlyRepeatRule(BaseRepeatRule):
         return ["FREQ=YEARLY"]
 
 
+@dataclass(slots=True)
 class ScheduleItem:
     """Класс элемента расписания.
 
@@ -174,65 +172,29 @@ class ScheduleItem:
         repeat_rule (BaseRepeatRule | None): Правило повторения.
     """
 
-    def __init__(
-        self,
-        start_datetime: datetime,
-        end_datetime: datetime,
-        subject: str,
-        lesson_type: str,
-        audience: str,
-        building: str,
-        teacher: str,
-        department: str,
-        repeat_rule: BaseRepeatRule | None = None,
-    ):
-        self._initialized: bool = False
-        self.start_datetime: datetime = start_datetime
-        self.end_datetime: datetime = end_datetime
-        self.subject: str = subject
-        self.lesson_type: str = lesson_type
-        self.audience: str = audience
-        self.building: str = building
-        self.teacher: str = teacher
-        self.department: str = department
-        self.repeat_rule = repeat_rule
-        self._initialized = True
-        self._validate()
-
-    def _validate(self) -> None:
-        self._validate_dates()
-
-    @property
-    def duration(self) -> timedelta:
-        return self.end_datetime - self.start_datetime
-
-    @property
-    def start_datetime(self) -> datetime:
-        return self._start_datetime
-
-    @start_datetime.setter
-    def start_datetime(self, value: datetime) -> None:
-        self._start_datetime = value
-        self._validate_dates()
-
-    @property
-    def end_datetime(self) -> datetime:
-        return self._end_datetime
-
-    @end_datetime.setter
-    def end_datetime(self, value: datetime) -> None:
-        self._end_datetime = value
-        self._validate_dates()
-
-    def _validate_dates(self) -> None:
+    start_datetime: datetime
+    end_datetime: datetime
+    subject: str
+    lesson_type: str
+    audience: str
+    building: str
+    teacher: str
+    department: str
+    repeat_rule: BaseRepeatRule | None = None
+
+    def __post_init__(self) -> None:
         """Валидирует, что дата начала меньше даты окончания.
 
         Вызывает ValueError, если проверка не проходит.
         """
-        if self._initialized and self.start_datetime >= self.end_datetime:
+        if self.start_datetime >= self.end_datetime:
             msg = f"Дата начала ({self.start_datetime}) должна быть меньше даты окончания ({self.end_datetime})"
             raise ValueError(msg)
 
+    @property
+    def duration(self) -> timedelta:
+        return self.end_datetime - self.start_datetime
+
 
 @dataclass(frozen=True)
 class FormatedScheduleItem: